@@ -1,31 +1,36 @@
 import dotenv
+import functools
 import os
 from pathlib import Path
 
 current_dir = Path(__file__).parent.absolute()
 
 
-# env_file = os.getenv("SCWEET_ENV_FILE", current_dir.parent.joinpath(".env"))
-# dotenv.load_dotenv(env_file, verbose=True)
+@functools.lru_cache(maxsize=None)
+def _load_env_file(env):
+    """ parse the <env> file on first access and keep its values in memory """
+    return dict(dotenv.dotenv_values(env))
 
 
-def load_env_variable(key, default_value=None, none_allowed=False):
-    v = os.getenv(key, default=default_value)
+def load_env_variable(key, default_value=None, none_allowed=False, env=None):
+    # variables already set in the environment take precedence over the .env file
+    v = os.getenv(key)
+    if v is None:
+        v = _load_env_file(env).get(key)
+    if v is None:
+        v = default_value
     if v is None and not none_allowed:
         raise RuntimeError(f"{key} returned {v} but this is not allowed!")
     return v
 
 
 def get_email(env):
-    dotenv.load_dotenv(env, verbose=True)
-    return load_env_variable("SCWEET_EMAIL", none_allowed=True)
+    return load_env_variable("SCWEET_EMAIL", none_allowed=True, env=env)
 
 
 def get_password(env):
-    dotenv.load_dotenv(env, verbose=True)
-    return load_env_variable("SCWEET_PASSWORD", none_allowed=True)
+    return load_env_variable("SCWEET_PASSWORD", none_allowed=True, env=env)
 
 
 def get_username(env):
-    dotenv.load_dotenv(env, verbose=True)
-    return load_env_variable("SCWEET_USERNAME", none_allowed=True)
+    return load_env_variable("SCWEET_USERNAME", none_allowed=True, env=env)
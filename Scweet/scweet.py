@@ -2,12 +2,29 @@ import csv
 import os
 import datetime
 import argparse
-from time import sleep
-import random
+import hashlib
 import pandas as pd
 
-from .utils import init_driver, get_last_date_from_csv, log_search_page, keep_scroling, dowload_images
+from .utils import init_driver, get_last_date_from_csv, log_search_page, keep_scroling, dowload_images, \
+    wait_for_tweets, parse_day
 
+# header of csv, also used as the columns of the returned dataframe
+HEADER = ('UserScreenName', 'UserName', 'Timestamp', 'Text', 'Embedded_text', 'Emojis', 'Comments', 'Likes', 'Retweets',
+          'Image link', 'Tweet URL')
+
+# above this number of words, the file is named after a hash of the words rather than the words themselves
+MAX_FILENAME_WORDS = 16
+
+
+def words_filename(words):
+    """ part of the csv file name that identifies the search <words> """
+    if len(words) <= MAX_FILENAME_WORDS:
+        return '_'.join(words)
+    # a long list of words would give a path too long for the file system. the words are sorted, so that the same
+    # words given in another order give the same file (and can be resumed)
+    words = sorted(words)
+    digest = hashlib.blake2b("\x00".join(words).encode(), digest_size=8).hexdigest()
+    return words[0] + '_' + digest
 
 
 def scrape(since, until=None, words=None, to_account=None, from_account=None, mention_account=None, interval=5, lang=None,
@@ -24,18 +41,14 @@ def scrape(since, until=None, words=None, to_account=None, from_account=None, me
     """
 
     # ------------------------- Variables : 
-    # header of csv
-    header = ['UserScreenName', 'UserName', 'Timestamp', 'Text', 'Embedded_text', 'Emojis', 'Comments', 'Likes', 'Retweets',
-                  'Image link', 'Tweet URL']
     # list that contains all data 
     data = []
     # unique tweet ids
     tweet_ids = set()
     # write mode 
     write_mode = 'w'
-    # start scraping from <since> until <until>
-    # add the <interval> to <since> to get <until_local> for the first refresh
-    until_local = datetime.datetime.strptime(since, '%Y-%m-%d') + datetime.timedelta(days=interval)
+    # start scraping from <since> until <until>, by search windows of <interval> days
+    interval_delta = datetime.timedelta(days=interval)
     # if <until>=None, set it to the actual date
     if until is None:
         until = datetime.date.today().strftime("%Y-%m-%d")
@@ -43,36 +56,37 @@ def scrape(since, until=None, words=None, to_account=None, from_account=None, me
     refresh = 0
 
     # ------------------------- settings :
-    # file path
-    if words:
-        if type(words) == str : 
-            words = words.split("//")
-        path = save_dir + "/" + '_'.join(words) + '_' + str(since).split(' ')[0] + '_' + \
-               str(until).split(' ')[0] + '.csv'
-    elif from_account:
-        path = save_dir + "/" + from_account + '_' + str(since).split(' ')[0] + '_' + str(until).split(' ')[
-            0] + '.csv'
-    elif to_account:
-        path = save_dir + "/" + to_account + '_' + str(since).split(' ')[0] + '_' + str(until).split(' ')[
-            0] + '.csv'
-    elif mention_account:
-        path = save_dir + "/" + mention_account + '_' + str(init_date).split(' ')[0] + '_' + str(max_date).split(' ')[
-            0] + '.csv'
-    elif hashtag:
-        path = save_dir + "/" + hashtag + '_' + str(since).split(' ')[0] + '_' + str(until).split(' ')[
-            0] + '.csv'
+    # file path : named after the first search criterion given, in this order
+    if words and type(words) == str:
+        words = words.split("//")
+    for name in (words_filename(words) if words else None, from_account, to_account, mention_account, hashtag):
+        if name:
+            path = save_dir + "/" + name + '_' + str(since).split(' ')[0] + '_' + str(until).split(' ')[0] + '.csv'
+            break
     # create the <save_dir>
-    if not os.path.exists(save_dir):
-        os.makedirs(save_dir)
+    os.makedirs(save_dir, exist_ok=True)
     # show images during scraping (for saving purpose)
     if save_images == True:
         show_images = True
-    # initiate the driver
-    driver = init_driver(headless, proxy, show_images)
-    # resume scraping from previous work
+    # resume scraping from previous work. this is read before starting the browser, so that a missing or empty
+    # file fails right away instead of after a driver was launched (and left open)
     if resume:
-        since = str(get_last_date_from_csv(path))[:10]
+        since = str(get_last_date_from_csv(path, interval=interval))[:10]
         write_mode = 'a'
+    # initiate the driver
+    driver = init_driver(headless, proxy, show_images)
+
+    # search criteria, the same for every refresh : only <since> and <until_local> change
+    search_query = dict(words=words, to_account=to_account, from_account=from_account, mention_account=mention_account,
+                        hashtag=hashtag, lang=lang, display_type=display_type, filter_replies=filter_replies,
+                        proximity=proximity, geocode=geocode, minreplies=minreplies, minlikes=minlikes,
+                        minretweets=minretweets)
+    # <since>, <until_local> and <until> are kept as dates and only formatted (isoformat) for the search url
+    since = parse_day(since)
+    until_date = parse_day(until)
+    # add the <interval> to <since> (after a resume, the last date of the csv) to get <until_local> for the first
+    # refresh
+    until_local = since + interval_delta
 
     #------------------------- start scraping : keep searching until until
     # open the file
@@ -80,22 +94,14 @@ def scrape(since, until=None, words=None, to_account=None, from_account=None, me
         writer = csv.writer(f)
         if write_mode == 'w':
             # write the csv header
-            writer.writerow(header)
+            writer.writerow(HEADER)
         # log search page for a specific <interval> of time and keep scrolling unltil scrolling stops or reach the <until>
-        while until_local <= datetime.datetime.strptime(until, '%Y-%m-%d'):
+        while until_local <= until_date:
             # number of scrolls
             scroll = 0
-            # convert <since> and <until_local> to str
-            if type(since) != str :
-                since = datetime.datetime.strftime(since, '%Y-%m-%d')
-            if type(until_local) != str :
-                until_local = datetime.datetime.strftime(until_local, '%Y-%m-%d')
             # log search page between <since> and <until_local>
-            path = log_search_page(driver=driver, words=words, since=since,
-                            until_local=until_local, to_account=to_account,
-                            from_account=from_account, mention_account=mention_account, hashtag=hashtag, lang=lang, 
-                            display_type=display_type, filter_replies=filter_replies, proximity=proximity,
-                            geocode=geocode, minreplies=minreplies, minlikes=minlikes, minretweets=minretweets)
+            path = log_search_page(driver=driver, since=since.isoformat(), until_local=until_local.isoformat(),
+                                   **search_query)
             # number of logged pages (refresh each <interval>)
             refresh += 1
             # number of days crossed
@@ -109,31 +115,23 @@ def scrape(since, until=None, words=None, to_account=None, from_account=None, me
             print(" path : {}".format(path))
             # number of tweets parsed
             tweet_parsed = 0
-            # sleep 
-            sleep(random.uniform(0.5, 1.5))
-            # start scrolling and get tweets
-            driver, data, writer, tweet_ids, scrolling, tweet_parsed, scroll, last_position = \
-                keep_scroling(driver, data, writer, tweet_ids, scrolling, tweet_parsed, limit, scroll, last_position)
+            # wait for the results to load. start scrolling and get tweets, unless the page shows no results
+            if wait_for_tweets(driver):
+                driver, data, writer, tweet_ids, scrolling, tweet_parsed, scroll, last_position = \
+                    keep_scroling(driver, data, writer, tweet_ids, scrolling, tweet_parsed, limit, scroll,
+                                  last_position)
 
             # keep updating <start date> and <end date> for every search
-            if type(since) == str:
-                since = datetime.datetime.strptime(since, '%Y-%m-%d') + datetime.timedelta(days=interval)
-            else:
-                since = since + datetime.timedelta(days=interval)
-            if type(since) != str:
-                until_local = datetime.datetime.strptime(until_local, '%Y-%m-%d') + datetime.timedelta(days=interval)
-            else:
-                until_local = until_local + datetime.timedelta(days=interval)
-
-    data = pd.DataFrame(data, columns = ['UserScreenName', 'UserName', 'Timestamp', 'Text', 'Embedded_text', 'Emojis', 
-                              'Comments', 'Likes', 'Retweets','Image link', 'Tweet URL'])
+            since += interval_delta
+            until_local += interval_delta
+
+    data = pd.DataFrame(data, columns=HEADER)
 
     # save images
     if save_images==True:
         print("Saving images ...")
         save_images_dir = "images"
-        if not os.path.exists(save_images_dir):
-            os.makedirs(save_images_dir)
+        os.makedirs(save_images_dir, exist_ok=True)
 
         dowload_images(data["Image link"], save_images_dir)
 
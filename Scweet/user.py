@@ -2,91 +2,130 @@ from . import utils
 from time import sleep
 import random
 import json
+import queue
+from concurrent.futures import ThreadPoolExecutor
+import re
 
+DIGIT_RE = re.compile(r'\d')
 
-def get_user_information(users, driver=None, headless=True):
-    """ get user information if the "from_account" argument is specified """
 
-    driver = utils.init_driver(headless=headless)
+def get_user_information(users, driver=None, headless=True, concurrency=1):
+    """ get user information if the "from_account" argument is specified
+        --concurrency : number of browsers visiting user pages in parallel (int)
+    """
 
-    users_info = {}
-
-    for i, user in enumerate(users):
-
-        log_user_page(user, driver)
-
-        if user is not None:
-
-            try:
-                following = driver.find_element_by_xpath(
-                    '//a[contains(@href,"/following")]/span[1]/span[1]').text
-                followers = driver.find_element_by_xpath(
-                    '//a[contains(@href,"/followers")]/span[1]/span[1]').text
-            except Exception as e:
-                # print(e)
-                return
+    targets = []
+    # each user page is visited once, even if the user is listed several times
+    for user in dict.fromkeys(users):
+        if user is None:
+            print("You must specify the user")
+            continue
+        targets.append(user)
+    if not targets:
+        return {}
+
+    # pool of drivers, each one reused for several users
+    drivers = queue.Queue()
+
+    def scrape_user(user):
+        driver = drivers.get()
+        try:
+            return get_user_info(user, driver)
+        finally:
+            drivers.put(driver)
+
+    try:
+        # drivers are started inside the try : if one fails to start, those already running are closed
+        for _ in range(max(1, min(concurrency, len(targets)))):
+            drivers.put(utils.init_driver(headless=headless))
+        if drivers.qsize() == 1:
+            # a single browser (one user, or concurrency=1) : no need for a thread pool
+            infos = [scrape_user(user) for user in targets]
+        else:
+            with ThreadPoolExecutor(max_workers=drivers.qsize()) as executor:
+                infos = list(executor.map(scrape_user, targets))
+    finally:
+        while not drivers.empty():
+            drivers.get().close()
 
-            try:
-                element = driver.find_element_by_xpath('//div[contains(@data-testid,"UserProfileHeader_Items")]//a[1]')
-                website = element.get_attribute("href")
-            except Exception as e:
-                # print(e)
-                website = ""
+    users_info = {}
 
-            try:
-                desc = driver.find_element_by_xpath('//div[contains(@data-testid,"UserDescription")]').text
-            except Exception as e:
-                # print(e)
-                desc = ""
-            a = 0
+    for user, info in zip(targets, infos):
+        if info is None:
+            return
+        following, followers, join_date, birthday, location, website, desc = info
+        print("--------------- " + user + " information : ---------------")
+        print("Following : ", following)
+        print("Followers : ", followers)
+        print("Location : ", location)
+        print("Join date : ", join_date)
+        print("Birth date : ", birthday)
+        print("Description : ", desc)
+        print("Website : ", website)
+        users_info[user] = info
+
+    return users_info
+
+
+def get_user_info(user, driver):
+    """ scrape the profile page of <user> with <driver> """
+
+    log_user_page(user, driver)
+
+    try:
+        following = driver.find_element_by_xpath(
+            '//a[contains(@href,"/following")]/span[1]/span[1]').text
+        followers = driver.find_element_by_xpath(
+            '//a[contains(@href,"/followers")]/span[1]/span[1]').text
+    except Exception as e:
+        # print(e)
+        return
+
+    try:
+        element = driver.find_element_by_xpath('//div[contains(@data-testid,"UserProfileHeader_Items")]//a[1]')
+        website = element.get_attribute("href")
+    except Exception as e:
+        # print(e)
+        website = ""
+
+    try:
+        desc = driver.find_element_by_xpath('//div[contains(@data-testid,"UserDescription")]').text
+    except Exception as e:
+        # print(e)
+        desc = ""
+    try:
+        join_date = driver.find_element_by_xpath(
+            '//div[contains(@data-testid,"UserProfileHeader_Items")]/span[3]').text
+        birthday = driver.find_element_by_xpath(
+            '//div[contains(@data-testid,"UserProfileHeader_Items")]/span[2]').text
+        location = driver.find_element_by_xpath(
+            '//div[contains(@data-testid,"UserProfileHeader_Items")]/span[1]').text
+    except Exception as e:
+        # print(e)
+        try:
+            join_date = driver.find_element_by_xpath(
+                '//div[contains(@data-testid,"UserProfileHeader_Items")]/span[2]').text
+            span1 = driver.find_element_by_xpath(
+                '//div[contains(@data-testid,"UserProfileHeader_Items")]/span[1]').text
+            if hasNumbers(span1):
+                birthday = span1
+                location = ""
+            else:
+                location = span1
+                birthday = ""
+        except Exception as e:
+            # print(e)
             try:
                 join_date = driver.find_element_by_xpath(
-                    '//div[contains(@data-testid,"UserProfileHeader_Items")]/span[3]').text
-                birthday = driver.find_element_by_xpath(
-                    '//div[contains(@data-testid,"UserProfileHeader_Items")]/span[2]').text
-                location = driver.find_element_by_xpath(
                     '//div[contains(@data-testid,"UserProfileHeader_Items")]/span[1]').text
+                birthday = ""
+                location = ""
             except Exception as e:
                 # print(e)
-                try:
-                    join_date = driver.find_element_by_xpath(
-                        '//div[contains(@data-testid,"UserProfileHeader_Items")]/span[2]').text
-                    span1 = driver.find_element_by_xpath(
-                        '//div[contains(@data-testid,"UserProfileHeader_Items")]/span[1]').text
-                    if hasNumbers(span1):
-                        birthday = span1
-                        location = ""
-                    else:
-                        location = span1
-                        birthday = ""
-                except Exception as e:
-                    # print(e)
-                    try:
-                        join_date = driver.find_element_by_xpath(
-                            '//div[contains(@data-testid,"UserProfileHeader_Items")]/span[1]').text
-                        birthday = ""
-                        location = ""
-                    except Exception as e:
-                        # print(e)
-                        join_date = ""
-                        birthday = ""
-                        location = ""
-            print("--------------- " + user + " information : ---------------")
-            print("Following : ", following)
-            print("Followers : ", followers)
-            print("Location : ", location)
-            print("Join date : ", join_date)
-            print("Birth date : ", birthday)
-            print("Description : ", desc)
-            print("Website : ", website)
-            users_info[user] = [following, followers, join_date, birthday, location, website, desc]
-
-            if i == len(users) - 1:
-                driver.close()
-                return users_info
-        else:
-            print("You must specify the user")
-            continue
+                join_date = ""
+                birthday = ""
+                location = ""
+    return [following, followers, join_date, birthday, location, website, desc]
 
 
 def log_user_page(user, driver, headless=True):
@@ -96,30 +135,25 @@ def log_user_page(user, driver, headless=True):
 
 
 def get_users_followers(users, env, verbose=1, headless=True, wait=2, limit=float('inf'), file_path=None):
-    followers = utils.get_users_follow(users, headless, env, "followers", verbose, wait=wait, limit=limit)
-
-    if file_path == None:
-        file_path = 'outputs/' + str(users[0]) + '_' + str(users[-1]) + '_' + 'followers.json'
-    else:
-        file_path = file_path + str(users[0]) + '_' + str(users[-1]) + '_' + 'followers.json'
-    with open(file_path, 'w') as f:
-        json.dump(followers, f)
-        print(f"file saved in {file_path}")
-    return followers
+    return save_users_follow(users, env, "followers", verbose, headless, wait, limit, file_path)
 
 
 def get_users_following(users, env, verbose=1, headless=True, wait=2, limit=float('inf'), file_path=None):
-    following = utils.get_users_follow(users, headless, env, "following", verbose, wait=wait, limit=limit)
+    return save_users_follow(users, env, "following", verbose, headless, wait, limit, file_path)
+
+
+def save_users_follow(users, env, follow, verbose=1, headless=True, wait=2, limit=float('inf'), file_path=None):
+    """ get the <follow> ("followers" or "following") of a list of users and save them in a json file """
+    follows = utils.get_users_follow(users, headless, env, follow, verbose, wait=wait, limit=limit)
 
     if file_path == None:
-        file_path = 'outputs/' + str(users[0]) + '_' + str(users[-1]) + '_' + 'following.json'
-    else:
-        file_path = file_path + str(users[0]) + '_' + str(users[-1]) + '_' + 'following.json'
+        file_path = 'outputs/'
+    file_path = file_path + str(users[0]) + '_' + str(users[-1]) + '_' + follow + '.json'
     with open(file_path, 'w') as f:
-        json.dump(following, f)
+        json.dump(follows, f)
         print(f"file saved in {file_path}")
-    return following
+    return follows
 
 
 def hasNumbers(inputString):
-    return any(char.isdigit() for char in inputString)
+    return DIGIT_RE.search(inputString) is not None
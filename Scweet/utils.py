@@ -1,11 +1,13 @@
 from io import StringIO, BytesIO
+import csv
+import functools
 import os
 import re
 from time import sleep
 import random
 import chromedriver_autoinstaller
 import geckodriver_autoinstaller
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
@@ -20,98 +22,112 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from . import const
 import urllib
+import urllib.request
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+import lxml.html
+from lxml import etree
 
 from .const import get_username, get_password, get_email
 
 
 # current_dir = pathlib.Path(__file__).parent.absolute()
 
-def get_data(card, save_images=False, save_dir=None):
-    """Extract data from tweet card"""
-    image_links = []
+TWITTER_URL = 'https://twitter.com'
+
+# codepoint of an emoji image, e.g. .../svg/1f600.svg
+EMOJI_RE = re.compile(r'svg/([a-z0-9]+)\.svg')
+
+# characters left as is in the search query (the others are percent-encoded)
+SEARCH_SAFE = "(),"
+
+# timestamp of a tweet, as saved by scrape : 2021-10-01T10:00:00.000Z
+TIMESTAMP_RE = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?Z')
+# bytes read at the end of a csv to find its latest timestamp
+TAIL_SIZE = 1 << 16
+
+# seconds to wait for the search results to show up / for the page to scroll further
+PAGE_TIMEOUT = 10
+SCROLL_TIMEOUT = 3
+# a tweet card of the search results / the element shown instead when the search has no results
+TWEET_XPATH = '//article[@data-testid="tweet"]'
+EMPTY_STATE_XPATH = '//div[@data-testid="emptyState"]'
+SCROLL_SCRIPT = 'window.scrollTo(0, document.body.scrollHeight); return window.pageYOffset;'
+CARDS_SCRIPT = '''return Array.from(document.querySelectorAll('article[data-testid="tweet"]'), card => card.outerHTML);'''
+
+# elements rendered on their own lines by the browser, and the marker put around them while reading a card text
+BLOCK_TAGS = frozenset(('address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt', 'figcaption', 'figure',
+                        'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol',
+                        'p', 'pre', 'section', 'table', 'tr', 'ul'))
+BLOCK_BREAK = '\x00'
+BLOCK_BREAK_RE = re.compile(r'\s*\x00[\s\x00]*')
+
+# xpaths of the tweet card fields, compiled once for all the cards
+CARD_XPATHS = {name: etree.XPath(xpath) for name, xpath in {
+    'postdate': './/time/@datetime',
+    'username': './/span',
+    'handle': './/span[contains(text(), "@")]',
+    'text': './/div[2]/div[2]/div[1]',
+    'embedded': './/div[2]/div[2]/div[2]',
+    'reply_cnt': './/div[@data-testid="reply"]',
+    'retweet_cnt': './/div[@data-testid="retweet"]',
+    'like_cnt': './/div[@data-testid="like"]',
+    'image_links': './/div[2]/div[2]//img[contains(@src, "https://pbs.twimg.com/")]/@src',
+    'promoted': './/div[2]/div[2]/*[last()]//span',
+    'emojis': './/img[contains(@src, "emoji")]/@src',
+    'tweet_url': './/a[contains(@href, "/status/")]/@href',
+}.items()}
 
-    try:
-        username = card.find_element(by=By.XPATH, value='.//span').text
-    except:
+
+def get_data(card, save_images=False, save_dir=None):
+    """Extract data from tweet card (a card element or its outerHTML)"""
+    # fetch the card markup once and run every lookup on the local tree instead of one webdriver call per field
+    if not isinstance(card, str):
+        card = card.get_attribute('outerHTML')
+    root = lxml.html.fromstring(card, base_url=TWITTER_URL)
+    root.make_links_absolute()
+
+    # cards without a timestamp (ads, deleted tweets) are dropped before anything else is read
+    postdate = _first_attribute(root, CARD_XPATHS['postdate'])
+    if postdate is None:
         return
 
-    try:
-        handle = card.find_element(by=By.XPATH, value='.//span[contains(text(), "@")]').text
-    except:
+    username = _first_text(root, CARD_XPATHS['username'])
+    if username is None:
         return
 
-    try:
-        postdate = card.find_element(by=By.XPATH, value='.//time').get_attribute('datetime')
-    except:
+    handle = _first_text(root, CARD_XPATHS['handle'])
+    if handle is None:
         return
 
-    try:
-        text = card.find_element(by=By.XPATH, value='.//div[2]/div[2]/div[1]').text
-    except:
-        text = ""
+    text = _first_text(root, CARD_XPATHS['text'], default="")
 
-    try:
-        embedded = card.find_element(by=By.XPATH, value='.//div[2]/div[2]/div[2]').text
-    except:
-        embedded = ""
+    embedded = _first_text(root, CARD_XPATHS['embedded'], default="")
 
     # text = comment + embedded
 
-    try:
-        reply_cnt = card.find_element(by=By.XPATH, value='.//div[@data-testid="reply"]').text
-    except:
-        reply_cnt = 0
+    reply_cnt = _first_text(root, CARD_XPATHS['reply_cnt'], default=0)
 
-    try:
-        retweet_cnt = card.find_element(by=By.XPATH, value='.//div[@data-testid="retweet"]').text
-    except:
-        retweet_cnt = 0
+    retweet_cnt = _first_text(root, CARD_XPATHS['retweet_cnt'], default=0)
 
-    try:
-        like_cnt = card.find_element(by=By.XPATH, value='.//div[@data-testid="like"]').text
-    except:
-        like_cnt = 0
+    like_cnt = _first_text(root, CARD_XPATHS['like_cnt'], default=0)
 
-    try:
-        elements = card.find_elements(by=By.XPATH, value='.//div[2]/div[2]//img[contains(@src, "https://pbs.twimg.com/")]')
-        for element in elements:
-            image_links.append(element.get_attribute('src'))
-    except:
-        image_links = []
+    image_links = [str(src) for src in CARD_XPATHS['image_links'](root)]
 
     # if save_images == True:
     #	for image_url in image_links:
     #		save_image(image_url, image_url, save_dir)
-    # handle promoted tweets
-
-    try:
-        promoted = card.find_element(by=By.XPATH, value='.//div[2]/div[2]/[last()]//span').text == "Promoted"
-    except:
-        promoted = False
-    if promoted:
+    # handle promoted tweets : cards whose last line reads "Promoted" (ads) are dropped
+    if _first_text(root, CARD_XPATHS['promoted']) == "Promoted":
         return
 
     # get a string of all emojis contained in the tweet
-    try:
-        emoji_tags = card.find_elements(by=By.XPATH, value='.//img[contains(@src, "emoji")]')
-    except:
-        return
-    emoji_list = []
-    for tag in emoji_tags:
-        try:
-            filename = tag.get_attribute('src')
-            emoji = chr(int(re.search(r'svg\/([a-z0-9]+)\.svg', filename).group(1), base=16))
-        except AttributeError:
-            continue
-        if emoji:
-            emoji_list.append(emoji)
-    emojis = ' '.join(emoji_list)
+    emoji_matches = (EMOJI_RE.search(filename) for filename in CARD_XPATHS['emojis'](root))
+    emojis = ' '.join([chr(int(match.group(1), base=16)) for match in emoji_matches if match])
 
     # tweet url
-    try:
-        element = card.find_element(by=By.XPATH, value='.//a[contains(@href, "/status/")]')
-        tweet_url = element.get_attribute('href')
-    except:
+    tweet_url = _first_attribute(root, CARD_XPATHS['tweet_url'])
+    if tweet_url is None:
         return
 
     tweet = (
@@ -119,6 +135,58 @@ def get_data(card, save_images=False, save_dir=None):
     return tweet
 
 
+def _first_text(root, xpath, default=None):
+    """ text of the first element matching the compiled <xpath>, or <default> if there is none """
+    elements = xpath(root)
+    if not elements:
+        return default
+    return _render_text(elements[0])
+
+
+def _render_text(element):
+    """ text of <element> laid out as the webdriver .text does : a line break at each <br> and between blocks """
+    parts = []
+    _collect_text(element, parts)
+    # consecutive block boundaries (and the spaces around them) make a single line break
+    return BLOCK_BREAK_RE.sub('\n', ''.join(parts)).strip()
+
+
+def _collect_text(element, parts):
+    """ append the text of <element> and its children to <parts>, with a BLOCK_BREAK around block elements """
+    if not isinstance(element.tag, str):
+        # comments and processing instructions : no text of their own
+        return
+    block = element.tag in BLOCK_TAGS
+    if block:
+        parts.append(BLOCK_BREAK)
+    if element.tag == 'br':
+        parts.append('\n')
+    if element.text:
+        parts.append(element.text)
+    for child in element:
+        _collect_text(child, parts)
+        if child.tail:
+            parts.append(child.tail)
+    if block:
+        parts.append(BLOCK_BREAK)
+
+
+def _first_attribute(root, xpath, default=None):
+    """ value of the first attribute matching the compiled <xpath>, or <default> if there is none """
+    values = xpath(root)
+    if not values:
+        return default
+    return str(values[0])
+
+
+@functools.lru_cache(maxsize=None)
+def get_driver_path(firefox=False):
+    """ install (or find) the geckodriver / chromedriver matching the local browser, once per process """
+    if firefox:
+        return geckodriver_autoinstaller.install()
+    return chromedriver_autoinstaller.install()
+
+
 def init_driver(headless=True, proxy=None, show_images=False, option=None, firefox=False, env=None):
     """ initiate a chromedriver or firefoxdriver instance
         --option : other option to add (str)
@@ -126,10 +194,9 @@ def init_driver(headless=True, proxy=None, show_images=False, option=None, firef
 
     if firefox:
         options = FirefoxOptions()
-        driver_path = geckodriver_autoinstaller.install()
     else:
         options = ChromeOptions()
-        driver_path = chromedriver_autoinstaller.install()
+    driver_path = get_driver_path(firefox)
 
     if headless is True:
         print("Scraping on headless mode.")
@@ -160,60 +227,58 @@ def log_search_page(driver, since, until_local, lang, display_type, words, to_ac
                     hashtag, filter_replies, proximity,
                     geocode, minreplies, minlikes, minretweets):
     """ Search for this query between since and until_local"""
-    # format the <from_account>, <to_account> and <hash_tags>
-    from_account = "(from%3A" + from_account + ")%20" if from_account is not None else ""
-    to_account = "(to%3A" + to_account + ")%20" if to_account is not None else ""
-    mention_account = "(%40" + mention_account + ")%20" if mention_account is not None else ""
-    hash_tags = "(%23" + hashtag + ")%20" if hashtag is not None else ""
+    # only the dates change from one refresh to the other : the rest of the url is built once per search
+    head, tail = search_url_parts(lang, display_type, tuple(words) if words is not None else None, to_account,
+                                  from_account, mention_account, hashtag, filter_replies, proximity, geocode,
+                                  minreplies, minlikes, minretweets)
+    path = ''.join((head, quote("until:" + until_local + " since:" + since + " ", safe=""), tail))
+    driver.get(path)
+    return path
 
-    if words is not None:
-        if len(words) == 1:
-            words = "(" + str(''.join(words)) + ")%20"
-        else:
-            words = "(" + str('%20OR%20'.join(words)) + ")%20"
-    else:
-        words = ""
 
+@functools.lru_cache(maxsize=None)
+def search_url_parts(lang, display_type, words, to_account, from_account, mention_account, hashtag, filter_replies,
+                     proximity, geocode, minreplies, minlikes, minretweets):
+    """ parts of the search url before and after the <until> and <since> dates (<words> must be a tuple) """
+    # search terms written before the dates : <words>, <from_account>, <to_account>, <mention_account>, <hashtag>
+    head_terms = []
+    if words is not None:
+        head_terms.append("(" + " OR ".join(words) + ")")
+    if from_account is not None:
+        head_terms.append("(from:" + from_account + ")")
+    if to_account is not None:
+        head_terms.append("(to:" + to_account + ")")
+    if mention_account is not None:
+        head_terms.append("(@" + mention_account + ")")
+    if hashtag is not None:
+        head_terms.append("(#" + hashtag + ")")
+
+    # search terms written after the dates
+    tail_terms = []
     if lang is not None:
-        lang = 'lang%3A' + lang
-    else:
-        lang = ""
-
-    until_local = "until%3A" + until_local + "%20"
-    since = "since%3A" + since + "%20"
-
-    if display_type == "Latest" or display_type == "latest":
-        display_type = "&f=live"
-    elif display_type == "Image" or display_type == "image":
-        display_type = "&f=image"
-    else:
-        display_type = ""
-
+        tail_terms.append("lang:" + lang)
     # filter replies
     if filter_replies == True:
-        filter_replies = "%20-filter%3Areplies"
-    else:
-        filter_replies = ""
+        tail_terms.append("-filter:replies")
     # geo
     if geocode is not None:
-        geocode = "%20geocode%3A" + geocode
-    else:
-        geocode = ""
+        tail_terms.append("geocode:" + geocode)
     # min number of replies
     if minreplies is not None:
-        minreplies = "%20min_replies%3A" + str(minreplies)
-    else:
-        minreplies = ""
+        tail_terms.append("min_replies:" + str(minreplies))
     # min number of likes
     if minlikes is not None:
-        minlikes = "%20min_faves%3A" + str(minlikes)
-    else:
-        minlikes = ""
+        tail_terms.append("min_faves:" + str(minlikes))
     # min number of retweets
     if minretweets is not None:
-        minretweets = "%20min_retweets%3A" + str(minretweets)
+        tail_terms.append("min_retweets:" + str(minretweets))
+
+    if display_type == "Latest" or display_type == "latest":
+        display_type = "&f=live"
+    elif display_type == "Image" or display_type == "image":
+        display_type = "&f=image"
     else:
-        minretweets = ""
+        display_type = ""
 
     # proximity
     if proximity == True:
@@ -221,16 +286,75 @@ def log_search_page(driver, since, until_local, lang, display_type, words, to_ac
     else:
         proximity = ""
 
-    path = 'https://twitter.com/search?q=' + words + from_account + to_account + mention_account + hash_tags + until_local + since + lang + filter_replies + geocode + minreplies + minlikes + minretweets + '&src=typed_query' + display_type + proximity
-    driver.get(path)
-    return path
+    # the terms are escaped here, so that accounts or words containing "&", "#", spaces... stay in the query
+    head = 'https://twitter.com/search?q=' + quote(''.join(term + " " for term in head_terms), safe=SEARCH_SAFE)
+    tail = ''.join((quote(" ".join(tail_terms), safe=SEARCH_SAFE), '&src=typed_query', display_type, proximity))
+    return head, tail
 
 
-def get_last_date_from_csv(path):
-    df = pd.read_csv(path)
+def parse_day(value):
+    """ parse a "%Y-%m-%d" date (or the day of a longer iso timestamp) given as <value> into a date """
+    try:
+        # fast path : zero-padded iso dates, as written by scrape and get_last_date_from_csv
+        return datetime.date.fromisoformat(value[:10])
+    except ValueError:
+        return datetime.datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def get_last_date_from_csv(path, tail_size=TAIL_SIZE, interval=None):
+    """ latest timestamp of a csv saved by scrape. rows are appended one search interval after the other, but they
+        are not in time order inside an interval : when the <interval> (days) of the search is given, the file is
+        read from its end, by blocks of at least <tail_size> bytes, until the rows of an earlier interval are reached.
+        otherwise (or if no valid row is found this way) the whole file is read """
+    if interval is not None:
+        latest = read_latest_timestamp(path, interval, tail_size)
+        if latest is not None:
+            return latest[:19] + '.000Z'
+    # only the timestamps are needed : skip tokenizing the text columns into python objects
+    df = pd.read_csv(path, usecols=["Timestamp"])
     return datetime.datetime.strftime(max(pd.to_datetime(df["Timestamp"])), '%Y-%m-%dT%H:%M:%S.000Z')
 
 
+def read_latest_timestamp(path, interval, tail_size=TAIL_SIZE):
+    """ latest timestamp of a csv saved by scrape with search intervals of <interval> days, read from the end of the
+        file. None if it has no valid row """
+    while True:
+        timestamps, whole_file = read_tail_timestamps(path, tail_size)
+        if timestamps:
+            # they all have the same ISO format (checked when read) : the greatest string is the latest date, no need
+            # to parse them
+            latest = max(timestamps)
+            # a tweet older than the start of the last interval (with one more day for the time zone of the search
+            # dates) belongs to an earlier interval : all the rows of the last one are in the tail
+            bound = (parse_day(latest) - datetime.timedelta(days=interval + 1)).isoformat()
+            if whole_file or min(timestamps)[:10] < bound:
+                return latest
+        elif whole_file:
+            return None
+        tail_size *= 2
+
+
+def read_tail_timestamps(path, tail_size=TAIL_SIZE):
+    """ timestamps of the rows found in the last <tail_size> bytes of a csv saved by scrape, and whether these bytes
+        cover the whole file """
+    with open(path, 'rb') as f:
+        header = next(csv.reader([f.readline().decode('utf-8-sig')]), [])
+        if "Timestamp" not in header:
+            return [], True
+        ts_idx = header.index("Timestamp")
+        header_end = f.tell()
+        start = max(header_end, f.seek(0, os.SEEK_END) - tail_size)
+        f.seek(start)
+        tail = f.read()
+    if start > header_end:
+        # drop the (probably partial) row the block starts in
+        tail = tail.split(b'\n', 1)[-1]
+    # a row cut inside a quoted text may shift the columns of a few rows : only well formed timestamps are kept
+    timestamps = [row[ts_idx] for row in csv.reader(StringIO(tail.decode('utf-8', 'ignore')))
+                  if len(row) > ts_idx and TIMESTAMP_RE.fullmatch(row[ts_idx])]
+    return timestamps, start == header_end
+
+
 def log_in(driver, env, timeout=20, wait=4):
     email = get_email(env)  # const.EMAIL
     password = get_password(env)  # const.PASSWORD
@@ -267,6 +391,21 @@ def log_in(driver, env, timeout=20, wait=4):
     sleep(random.uniform(wait, wait + 1))
 
 
+def wait_for_tweets(driver, timeout=PAGE_TIMEOUT):
+    """ wait until the first tweet card of the page is rendered. return False only if the page shows that the search
+        has no results """
+    try:
+        # an empty search shows its "no results" element : no need to wait the whole <timeout> for tweets
+        WebDriverWait(driver, timeout).until(
+            lambda d: d.find_elements(By.XPATH, TWEET_XPATH) or d.find_elements(By.XPATH, EMPTY_STATE_XPATH))
+    except TimeoutException:
+        # slow page : it is still scrolled and parsed
+        print("No tweets showed up after " + str(timeout) + " seconds, scrolling anyway ...")
+        return True
+    return len(driver.find_elements(By.XPATH, TWEET_XPATH)) > 0 or \
+        len(driver.find_elements(By.XPATH, EMPTY_STATE_XPATH)) == 0
+
+
 def keep_scroling(driver, data, writer, tweet_ids, scrolling, tweet_parsed, limit, scroll, last_position,
                   save_images=False):
     """ scrolling function for tweets crawling"""
@@ -274,34 +413,39 @@ def keep_scroling(driver, data, writer, tweet_ids, scrolling, tweet_parsed, limi
     save_images_dir = "/images"
 
     if save_images == True:
-        if not os.path.exists(save_images_dir):
-            os.mkdir(save_images_dir)
+        os.makedirs(save_images_dir, exist_ok=True)
 
     while scrolling and tweet_parsed < limit:
-        sleep(random.uniform(0.5, 1.5))
-        # get the card of tweets
-        page_cards = driver.find_elements(by=By.XPATH, value='//article[@data-testid="tweet"]')  # changed div by article
+        # get the markup of all the tweet cards of the page in a single call
+        page_cards = driver.execute_script(CARDS_SCRIPT)
+        # new tweets of this page, saved together once the page is parsed
+        page_tweets = []
         for card in page_cards:
             tweet = get_data(card, save_images, save_images_dir)
             if tweet:
-                # check if the tweet is unique
-                tweet_id = ''.join(tweet[:-2])
+                # check if the tweet is unique : its url identifies it without keeping a second copy of its text
+                tweet_id = tweet[-1]
                 if tweet_id not in tweet_ids:
                     tweet_ids.add(tweet_id)
-                    data.append(tweet)
+                    page_tweets.append(tweet)
                     last_date = str(tweet[2])
                     print("Tweet made at: " + str(last_date) + " is found.")
-                    writer.writerow(tweet)
-                    tweet_parsed += 1
-                    if tweet_parsed >= limit:
+                    if tweet_parsed + len(page_tweets) >= limit:
                         break
+        data.extend(page_tweets)
+        writer.writerows(page_tweets)
+        tweet_parsed += len(page_tweets)
         scroll_attempt = 0
         while tweet_parsed < limit:
             # check scroll position
             scroll += 1
             print("scroll ", scroll)
-            sleep(random.uniform(0.5, 1.5))
-            driver.execute_script('window.scrollTo(0, document.body.scrollHeight);')
+            # keep scrolling until the page moves (new tweets were loaded) instead of sleeping a fixed time
+            try:
+                WebDriverWait(driver, SCROLL_TIMEOUT).until(
+                    lambda d: d.execute_script(SCROLL_SCRIPT) != last_position)
+            except TimeoutException:
+                pass
             curr_position = driver.execute_script("return window.pageYOffset;")
             if last_position == curr_position:
                 scroll_attempt += 1
@@ -309,8 +453,6 @@ def keep_scroling(driver, data, writer, tweet_ids, scrolling, tweet_parsed, limi
                 if scroll_attempt >= 2:
                     scrolling = False
                     break
-                else:
-                    sleep(random.uniform(0.5, 1.5))  # attempt another scroll
             else:
                 last_position = curr_position
                 break
@@ -330,7 +472,8 @@ def get_users_follow(users, headless, env, follow=None, verbose=1, wait=2, limit
     # followers and following dict of each user
     follows_users = {}
 
-    for user in users:
+    # each user is crawled once, even if it is listed several times
+    for user in dict.fromkeys(users):
         # if the login fails, find the new log in button and log in again.
         if check_exists_by_link_text("Log in", driver):
             print("Login failed. Retry...")
@@ -353,25 +496,25 @@ def get_users_follow(users, headless, env, follow=None, verbose=1, wait=2, limit
         # check if we must keep scrolling
         scrolling = True
         last_position = driver.execute_script("return window.pageYOffset;")
-        follows_elem = []
-        follow_ids = set()
+        # profile url -> '@handle' of each following / follower, in the order they were found
+        follows_elem = {}
         is_limit = False
+        # this is the primaryColumn attribute that contains both followings and followers. it stays in place while
+        # scrolling, so it is looked up once per user
+        primaryColumn = driver.find_element(by=By.XPATH, value='//div[contains(@data-testid,"primaryColumn")]')
         while scrolling and not is_limit:
             # get the card of following or followers
-            # this is the primaryColumn attribute that contains both followings and followers
-            primaryColumn = driver.find_element(by=By.XPATH, value='//div[contains(@data-testid,"primaryColumn")]')
-            # extract only the Usercell
-            page_cards = primaryColumn.find_elements(by=By.XPATH, value='//div[contains(@data-testid,"UserCell")]')
+            # extract only the Usercell, searching inside the column rather than the whole page
+            page_cards = primaryColumn.find_elements(by=By.XPATH, value='.//div[contains(@data-testid,"UserCell")]')
             for card in page_cards:
                 # get the following or followers element
                 element = card.find_element(by=By.XPATH, value='.//div[1]/div[1]/div[1]//a[1]')
                 follow_elem = element.get_attribute('href')
                 # append to the list
                 follow_id = str(follow_elem)
-                follow_elem = '@' + str(follow_elem).split('/')[-1]
-                if follow_id not in follow_ids:
-                    follow_ids.add(follow_id)
-                    follows_elem.append(follow_elem)
+                follow_elem = '@' + follow_id.rsplit('/', 1)[-1]
+                if follow_id not in follows_elem:
+                    follows_elem[follow_id] = follow_elem
                 if len(follows_elem) >= limit:
                     is_limit = True
                     break
@@ -396,7 +539,7 @@ def get_users_follow(users, headless, env, follow=None, verbose=1, wait=2, limit
                     last_position = curr_position
                     break
 
-        follows_users[user] = follows_elem
+        follows_users[user] = list(follows_elem.values())
 
     return follows_users
 
@@ -418,7 +561,10 @@ def check_exists_by_xpath(xpath, driver):
     return True
 
 
-def dowload_images(urls, save_dir):
-    for i, url_v in enumerate(urls):
-        for j, url in enumerate(url_v):
-            urllib.request.urlretrieve(url, save_dir + '/' + str(i + 1) + '_' + str(j + 1) + ".jpg")
+def dowload_images(urls, save_dir, max_workers=8):
+    """ download the images of each tweet as <save_dir>/<tweet n°>_<image n°>.jpg, several at a time """
+    downloads = [(url, save_dir + '/' + str(i + 1) + '_' + str(j + 1) + ".jpg")
+                 for i, url_v in enumerate(urls) for j, url in enumerate(url_v)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # consume the results so that a failed download raises, as it did when downloading one by one
+        list(executor.map(lambda download: urllib.request.urlretrieve(*download), downloads))